@@ -41,7 +41,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     domain_data = hass.data.get(DOMAIN)
     if domain_data and entry.entry_id in domain_data:
-        domain_data.pop(entry.entry_id)
+        coordinator: UtilitiesEmailTrackerCoordinator = domain_data.pop(entry.entry_id)
+        await coordinator.async_shutdown()
         if not domain_data:
             hass.data.pop(DOMAIN)
 
@@ -29,6 +29,10 @@ EMAIL_ATTR_ADDRESS = "from_address"
 EMAIL_ATTR_SUBJECT = "subject"
 EMAIL_ATTR_BODY = "body"
 EMAIL_ATTR_DATE = "date"
+# Flattened body and lowercased "subject body" text, each built at most once
+# per email and shared by every parser
+EMAIL_ATTR_TEXT = "text"
+EMAIL_ATTR_SEARCH_TEXT = "search_text"
 
 # Sensor attributes
 ATTR_BILLS = "bills"
@@ -41,4 +45,6 @@ ATTR_BILLING_DATE_ISO = "billing_date_iso"
 
 # Misc
 IMAP_TIMEOUT = 10
+FETCH_BATCH_SIZE = 100
+MAX_MESSAGE_SIZE = 512 * 1024  # bytes; bill notifications are small
 DEFAULT_SNIPPET_LENGTH = 240
@@ -1,19 +1,23 @@
 """Data update coordinator for Utilities Email Tracker."""
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from email import message_from_bytes
+from email.message import EmailMessage
+from email.policy import default as _email_policy
+from email.utils import parseaddr
+import heapq
 import logging
+import os
 from typing import Any
 
 from imapclient import IMAPClient
 from imapclient.exceptions import IMAPClientError
-from mailparser import parse_from_bytes
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from email.utils import parseaddr
-
 from .const import (
     ATTR_BILLS,
     ATTR_COUNT,
@@ -41,12 +45,22 @@ from .const import (
     EMAIL_ATTR_DATE,
     EMAIL_ATTR_FROM,
     EMAIL_ATTR_SUBJECT,
+    FETCH_BATCH_SIZE,
     IMAP_TIMEOUT,
+    MAX_MESSAGE_SIZE,
 )
-from .parsers import extract_bills
+from .parsers import PARSER_SEARCH_TERMS, extract_bills
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the headers the parsers need plus the MIME headers required to decode
+# the body. PEEK keeps the server from setting \Seen on fetched messages.
+_HEADER_FIELDS = (
+    "FROM SUBJECT DATE MESSAGE-ID MIME-VERSION CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+)
+_FETCH_HEADERS = f"BODY.PEEK[HEADER.FIELDS ({_HEADER_FIELDS})]"
+_FETCH_TEXT = "BODY.PEEK[TEXT]"
+
 
 class UtilitiesEmailTrackerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator responsible for polling email inbox for utility bills."""
@@ -63,6 +77,45 @@ class UtilitiesEmailTrackerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.options = options
         self.entry_id = entry_id
 
+        # Options changes reload the entry and build a new coordinator, so the
+        # settings can be resolved once here instead of on every poll.
+        self._host: str = config.get(CONF_IMAP_SERVER, DEFAULT_IMAP_SERVER)
+        self._port: int = config.get(CONF_IMAP_PORT, DEFAULT_IMAP_PORT)
+        self._ssl: bool = config.get(CONF_USE_SSL, DEFAULT_USE_SSL)
+        self._user: str = config[CONF_EMAIL]
+        self._password: str = config[CONF_PASSWORD]
+        self._folder: str = options.get(CONF_EMAIL_FOLDER, DEFAULT_FOLDER)
+        self._days_old: int = options.get(
+            CONF_DAYS_OLD, config.get(CONF_DAYS_OLD, DEFAULT_DAYS_OLD)
+        )
+        self._max_messages: int = options.get(CONF_MAX_MESSAGES, DEFAULT_MAX_MESSAGES)
+
+        # One IMAP session is kept open across polls. All blocking IMAP work
+        # runs on a dedicated single thread so slow servers never tie up the
+        # shared Home Assistant executor, and the session is only ever used
+        # from that thread.
+        self._server: IMAPClient | None = None
+        self._imap_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{DOMAIN}_imap"
+        )
+        # Each fetched batch is decoded and run through the bill parsers here,
+        # overlapping the network read of the next batch and keeping the regex
+        # work off the event loop
+        self._parse_executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            thread_name_prefix=f"{DOMAIN}_parse",
+        )
+        # Bills parsed from each message UID, reused while the message stays in
+        # the search window so unchanged mail is neither downloaded nor parsed
+        # again. UIDs are only stable for one UIDVALIDITY and bill status
+        # depends on the date, so a change in either empties the cache.
+        self._bill_cache: dict[int, list[dict[str, Any]]] = {}
+        self._bill_cache_date: str | None = None
+        self._uid_validity: int | None = None
+        # Shutdown runs both from the entry's unload callbacks and from
+        # async_unload_entry; only the first call may touch the executors
+        self._closed = False
+
         scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         update_interval = timedelta(minutes=scan_interval)
 
@@ -76,133 +129,194 @@ class UtilitiesEmailTrackerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch the latest bills from the mailbox."""
         try:
-            emails = await self.hass.async_add_executor_job(self._fetch_emails)
-            bills = extract_bills(emails)
+            today_iso = date.today().isoformat()
+            if today_iso != self._bill_cache_date:
+                self._bill_cache.clear()
+                self._bill_cache_date = today_iso
+
+            uid_validity, message_ids, parsed = await self.hass.loop.run_in_executor(
+                self._imap_executor,
+                self._fetch_bills,
+                today_iso,
+                frozenset(self._bill_cache),
+                self._uid_validity,
+            )
+            if uid_validity != self._uid_validity:
+                self._bill_cache.clear()
+                self._uid_validity = uid_validity
+
+            self._bill_cache.update(parsed)
+            # Messages that left the search window drop out of the cache
+            self._bill_cache = {
+                uid: self._bill_cache[uid]
+                for uid in message_ids
+                if uid in self._bill_cache
+            }
+            bills = [bill for cached in self._bill_cache.values() for bill in cached]
             limited_bills = self._limit_bills(bills)
             summary = self._build_summary(limited_bills)
+            # Naive UTC, matching the received timestamps on each bill
+            last_update = datetime.now(timezone.utc).replace(tzinfo=None)
 
             return {
                 ATTR_BILLS: limited_bills,
                 ATTR_SUMMARY: summary,
                 ATTR_COUNT: len(limited_bills),
-                ATTR_LAST_UPDATE: datetime.utcnow().isoformat(),
+                ATTR_LAST_UPDATE: last_update.isoformat(),
             }
         except Exception as err:  # pragma: no cover - defensive
             raise UpdateFailed(f"Unable to refresh utility bills: {err}") from err
 
-    def _fetch_emails(self) -> list[dict[str, Any]]:
-        """Fetch raw email payloads from the IMAP server."""
-        server_host = self.config.get(CONF_IMAP_SERVER, DEFAULT_IMAP_SERVER)
-        server_port = self.config.get(CONF_IMAP_PORT, DEFAULT_IMAP_PORT)
-        use_ssl = self.config.get(CONF_USE_SSL, DEFAULT_USE_SSL)
-        username = self.config[CONF_EMAIL]
-        password = self.config[CONF_PASSWORD]
-        folder = self.options.get(CONF_EMAIL_FOLDER, DEFAULT_FOLDER)
-        days_old = self.options.get(
-            CONF_DAYS_OLD, self.config.get(CONF_DAYS_OLD, DEFAULT_DAYS_OLD)
-        )
-
-        search_date = date.today() - timedelta(days=days_old)
+    async def async_shutdown(self) -> None:
+        """Log out of the cached IMAP session when the entry is unloaded."""
+        await super().async_shutdown()
+        if self._closed:
+            return
+        self._closed = True
+        await self.hass.loop.run_in_executor(self._imap_executor, self._close_server)
+        self._imap_executor.shutdown(wait=False)
+        self._parse_executor.shutdown(wait=False)
+
+    def _fetch_bills(
+        self,
+        today_iso: str,
+        cached_uids: frozenset[int],
+        cached_validity: int | None,
+    ) -> tuple[int | None, list[int], list[tuple[int, list[dict[str, Any]]]]]:
+        """Fetch and parse the messages in the search window not parsed yet.
+
+        Returns the folder's UIDVALIDITY, every UID in the window and the bills
+        found in each newly fetched message; skipped or unreadable messages are
+        reported with no bills. ``cached_uids`` are only skipped while the
+        folder still has ``cached_validity``.
+        """
+        search_date = date.today() - timedelta(days=self._days_old)
         search_flag = ["SINCE", search_date]
 
-        _LOGGER.debug(
-            "Connecting to IMAP %s:%s (SSL=%s) for %s",
-            server_host,
-            server_port,
-            use_ssl,
-            username,
-        )
-
-        server = IMAPClient(
-            server_host,
-            port=server_port,
-            use_uid=True,
-            ssl=use_ssl,
-            timeout=IMAP_TIMEOUT,
-        )
-
         try:
-            server.login(username, password)
-            server.select_folder(folder, readonly=True)
-            message_ids = server.search(search_flag)
+            server = self._get_server()
+            folder = server.select_folder(self._folder, readonly=True)
+            uid_validity = folder.get(b"UIDVALIDITY")
+            if uid_validity != cached_validity:
+                cached_uids = frozenset()
+            try:
+                message_ids = server.search(_build_search_criteria(search_flag))
+            except IMAPClientError as err:
+                # Some servers choke on long OR chains; fall back to date only
+                _LOGGER.debug("Filtered search rejected, using SINCE only: %s", err)
+                message_ids = server.search(search_flag)
 
+            new_ids = [uid for uid in message_ids if uid not in cached_uids]
             _LOGGER.debug(
-                "Found %s messages in %s since %s",
+                "Found %s messages in %s since %s, %s not yet parsed",
                 len(message_ids),
-                folder,
+                self._folder,
                 search_date,
+                len(new_ids),
             )
 
-            emails: list[dict[str, Any]] = []
-            if not message_ids:
-                return emails
-
-            response = server.fetch(message_ids, ["RFC822"])
-            for uid, data in response.items():
-                raw = data.get(b"RFC822")
-                if raw is None:
-                    continue
-
-                try:
-                    mail = parse_from_bytes(raw)
-                except Exception as err:  # pragma: no cover - defensive
-                    _LOGGER.debug("Failed to parse message %s: %s", uid, err)
-                    continue
-
-                from_display, from_address = _parse_from(mail.from_)
-
-                body = mail.body or ""
-                if hasattr(mail, "text_html") and mail.text_html:
-                    body = "\n".join(mail.text_html)
-                elif hasattr(mail, "text_plain") and mail.text_plain and not body:
-                    body = "\n".join(mail.text_plain)
-
-                emails.append(
-                    {
-                        "uid": uid,
-                        "message_id": getattr(mail, "message_id", None),
-                        EMAIL_ATTR_FROM: from_display,
-                        EMAIL_ATTR_ADDRESS: from_address,
-                        EMAIL_ATTR_SUBJECT: mail.subject,
-                        EMAIL_ATTR_BODY: body,
-                        EMAIL_ATTR_DATE: _format_date(mail.date),
-                    }
-                )
-
-            return emails
+            parsed: list[tuple[int, list[dict[str, Any]]]] = []
+            if not new_ids:
+                return uid_validity, message_ids, parsed
+
+            # Fetch in bounded batches so huge UID sets don't exceed server
+            # request limits; each batch is parsed on the pool while the next
+            # one is being downloaded
+            pending: list[Future[list[tuple[int, list[dict[str, Any]]]]]] = []
+            for start in range(0, len(new_ids), FETCH_BATCH_SIZE):
+                batch = new_ids[start : start + FETCH_BATCH_SIZE]
+                raw_messages, skipped = _fetch_batch(server, batch)
+                # Oversized or incomplete messages are cached without bills so
+                # they aren't fetched again on every poll
+                parsed.extend((uid, []) for uid in skipped)
+                if raw_messages:
+                    pending.append(
+                        self._parse_executor.submit(
+                            _parse_messages, raw_messages, today_iso
+                        )
+                    )
+
+            for future in pending:
+                parsed.extend(future.result())
+
+            return uid_validity, message_ids, parsed
         except IMAPClientError as err:
+            self._close_server()
             raise UpdateFailed(f"IMAP error: {err}") from err
-        finally:
+        except Exception:
+            # Connection state is unknown; reconnect on the next poll
+            self._close_server()
+            raise
+
+    def _get_server(self) -> IMAPClient:
+        """Return a logged-in IMAP client, reusing the cached one if alive."""
+        if self._server is not None:
+            try:
+                self._server.noop()
+                return self._server
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Cached IMAP connection is stale: %s", err)
+                self._close_server()
+
+        _LOGGER.debug(
+            "Connecting to IMAP %s:%s (SSL=%s) for %s",
+            self._host,
+            self._port,
+            self._ssl,
+            self._user,
+        )
+
+        server = IMAPClient(
+            self._host,
+            port=self._port,
+            use_uid=True,
+            ssl=self._ssl,
+            timeout=IMAP_TIMEOUT,
+        )
+        try:
+            server.login(self._user, self._password)
+        except Exception:
             try:
-                server.logout()
+                server.shutdown()
             except Exception:  # pragma: no cover - best effort cleanup
                 pass
+            raise
+
+        self._server = server
+        return server
+
+    def _close_server(self) -> None:
+        """Log out and drop the cached IMAP client."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+
+        try:
+            server.logout()
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
 
     def _limit_bills(self, bills: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Limit the number of tracked bills to configured maximum."""
         if not bills:
             return []
 
-        # Deduplicate by message id / uid
-        seen = set()
-        unique_bills: list[dict[str, Any]] = []
+        # Deduplicate by message id / uid, first occurrence wins
+        by_id: dict[Any, dict[str, Any]] = {}
+        unidentified: list[dict[str, Any]] = []
         for bill in bills:
             identifier = bill.get("id")
-            if identifier and identifier in seen:
-                continue
             if identifier:
-                seen.add(identifier)
-            unique_bills.append(bill)
-
-        unique_bills.sort(
-            key=lambda item: item.get("received") or "",
-            reverse=True,
-        )
-
-        max_messages = self.options.get(CONF_MAX_MESSAGES, DEFAULT_MAX_MESSAGES)
-        if len(unique_bills) <= max_messages:
+                by_id.setdefault(identifier, bill)
+            else:
+                unidentified.append(bill)
+        unique_bills = [*by_id.values(), *unidentified]
+
+        # Newest first; only a full sort when everything is kept
+        if len(unique_bills) <= self._max_messages:
+            unique_bills.sort(key=_received_key, reverse=True)
             return unique_bills
-        return unique_bills[:max_messages]
+        return heapq.nlargest(self._max_messages, unique_bills, key=_received_key)
 
     def _build_summary(self, bills: list[dict[str, Any]]) -> dict[str, Any]:
         """Construct summary metrics for exposed attributes."""
@@ -235,16 +349,136 @@ class UtilitiesEmailTrackerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return summary
 
 
-def _parse_from(from_list: Any) -> tuple[str | None, str | None]:
-    """Extract a usable display name and address from mailparser output."""
-    if not from_list:
+def _build_search_criteria(base: list[Any]) -> list[Any]:
+    """Narrow the base criteria to mail a parser can handle."""
+    if not PARSER_SEARCH_TERMS:
+        return base
+
+    # IMAP OR is binary and prefix-notation: OR OR a b c == (a OR b) OR c
+    criteria = list(base)
+    criteria.extend(["OR"] * (len(PARSER_SEARCH_TERMS) - 1))
+    for key, value in PARSER_SEARCH_TERMS:
+        criteria.extend([key, value])
+    return criteria
+
+
+def _fetch_batch(
+    server: IMAPClient, message_ids: list[int]
+) -> tuple[list[tuple[int, bytes]], list[int]]:
+    """Download one batch of raw messages.
+
+    Returns the downloaded messages and the UIDs that were skipped, either
+    for being oversized or for coming back without headers or text.
+    """
+    sizes = server.fetch(message_ids, ["RFC822.SIZE"])
+    wanted: list[int] = []
+    skipped: list[int] = []
+    for uid, data in sizes.items():
+        size = data.get(b"RFC822.SIZE") or 0
+        if size > MAX_MESSAGE_SIZE:
+            _LOGGER.debug("Skipping message %s (%s bytes)", uid, size)
+            skipped.append(uid)
+            continue
+        wanted.append(uid)
+
+    raw_messages: list[tuple[int, bytes]] = []
+    if not wanted:
+        return raw_messages, skipped
+
+    response = server.fetch(wanted, [_FETCH_HEADERS, _FETCH_TEXT])
+    for uid, data in response.items():
+        raw = _assemble_message(data)
+        if raw is None:
+            _LOGGER.debug("Skipping message %s with no headers or text", uid)
+            skipped.append(uid)
+            continue
+        raw_messages.append((uid, raw))
+
+    return raw_messages, skipped
+
+
+def _parse_messages(
+    raw_messages: list[tuple[int, bytes]], today_iso: str
+) -> list[tuple[int, list[dict[str, Any]]]]:
+    """Decode a downloaded batch and extract the bills from each message.
+
+    Unreadable messages, and messages a parser fails on unexpectedly, are
+    reported with no bills so they aren't downloaded again on the next poll.
+    """
+    results: list[tuple[int, list[dict[str, Any]]]] = []
+    for uid, raw in raw_messages:
+        email = _parse_message(uid, raw)
+        if email is None:
+            results.append((uid, []))
+            continue
+
+        try:
+            bills = extract_bills([email], today_iso=today_iso)
+        except Exception:  # pylint: disable=broad-except
+            # A parser bug; the UID is cached so this is logged once per
+            # message rather than failing every poll
+            _LOGGER.exception("Unexpected error parsing message %s", uid)
+            bills = []
+        results.append((uid, bills))
+    return results
+
+
+def _parse_message(uid: int, raw: bytes) -> dict[str, Any] | None:
+    """Turn raw message bytes into the email dict consumed by the parsers."""
+    # The default policy parses headers lazily, so a malformed header raises
+    # on access rather than in message_from_bytes
+    try:
+        mail = message_from_bytes(raw, policy=_email_policy)
+        body = _extract_body(mail)
+        from_display, from_address = _parse_from(mail.get("From", ""))
+        message_id = mail.get("Message-ID")
+        subject = str(mail.get("Subject", ""))
+        received = _format_date(mail.get("Date"))
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Failed to parse message %s: %s", uid, err)
+        return None
+
+    return {
+        "uid": uid,
+        "message_id": str(message_id).strip() if message_id else None,
+        EMAIL_ATTR_FROM: from_display,
+        EMAIL_ATTR_ADDRESS: from_address,
+        EMAIL_ATTR_SUBJECT: subject,
+        EMAIL_ATTR_BODY: body,
+        EMAIL_ATTR_DATE: received,
+    }
+
+
+def _assemble_message(data: dict[bytes, Any]) -> bytes | None:
+    """Rebuild a parseable message from separately fetched headers and text."""
+    headers = None
+    for key, value in data.items():
+        # Servers echo the field list back in varying forms, so match on prefix
+        if isinstance(key, bytes) and key.upper().startswith(b"BODY[HEADER"):
+            headers = value
+            break
+
+    text = data.get(b"BODY[TEXT]")
+    if headers is None or text is None:
+        return None
+
+    return headers.rstrip(b"\r\n") + b"\r\n\r\n" + text
+
+
+def _extract_body(mail: EmailMessage) -> str:
+    """Return the HTML body (or plain text fallback) without touching attachments."""
+    body_part = mail.get_body(preferencelist=("html", "plain"))
+    if body_part is None:
+        return ""
+    return body_part.get_content()
+
+
+def _parse_from(from_header: Any) -> tuple[str | None, str | None]:
+    """Extract a usable display name and address from the From header."""
+    if not from_header:
         return None, None
 
-    item = from_list[0]
-    if isinstance(item, (list, tuple)) and len(item) == 2:
-        display, address = item
-    else:
-        display, address = parseaddr(str(item))
+    display, address = parseaddr(str(from_header))
 
     display = (display or "").strip() or None
     address = (address or "").strip() or None
@@ -256,6 +490,14 @@ def _format_date(raw_date: Any) -> str | None:
     if raw_date is None:
         return None
 
+    # Date headers parsed with the default policy carry the datetime already;
+    # report them as naive UTC so "received" values sort consistently
+    header_date = getattr(raw_date, "datetime", None)
+    if isinstance(header_date, datetime):
+        if header_date.tzinfo is not None:
+            header_date = header_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return header_date.isoformat()
+
     if isinstance(raw_date, datetime):
         return raw_date.isoformat()
 
@@ -266,14 +508,19 @@ def _format_date(raw_date: Any) -> str | None:
         return str(raw_date)
 
 
+def _received_key(bill: dict[str, Any]) -> str:
+    """Sort key for bills by received timestamp, missing values last."""
+    return bill.get("received") or ""
+
+
 def _min_iso_date(existing: str | None, candidate: str) -> str:
     """Return the earliest ISO date between existing and candidate."""
     if not existing:
         return candidate
 
     try:
-        existing_date = datetime.fromisoformat(existing).date()
-        candidate_date = datetime.fromisoformat(candidate).date()
+        existing_date = date.fromisoformat(existing)
+        candidate_date = date.fromisoformat(candidate)
     except ValueError:
         return existing
 
@@ -1,9 +1,11 @@
 """Email parsing helpers for Utilities Email Tracker."""
 from __future__ import annotations
 
+from datetime import date
 import logging
 from typing import Any
 
+from ._common import mentions
 from .duke_energy import parse_duke_energy
 from .psnc_energy import parse_psnc_energy
 from .raleigh_water import parse_raleigh_water
@@ -18,16 +20,65 @@ PARSERS = [
     ("truist_mortgage", parse_truist_mortgage),
 ]
 
+# IMAP SEARCH criteria that cover every parser above; the coordinator ORs
+# these together so unrelated mail is never fetched. TEXT matches headers and
+# body, which catches bills forwarded from a personal address under any
+# subject. TEXT terms are single words because servers match them against the
+# raw body, where longer phrases may be split by markup.
+PARSER_SEARCH_TERMS = [
+    ("FROM", "duke-energy.com"),
+    ("TEXT", "Duke"),
+    ("FROM", "psncenergy.com"),
+    ("FROM", "dominionenergy"),
+    ("FROM", "enbridge"),
+    ("TEXT", "PSNC"),
+    ("TEXT", "Dominion"),
+    ("TEXT", "Enbridge"),
+    ("FROM", "raleighnc.gov"),
+    ("TEXT", "Raleigh"),
+    ("FROM", "truist.com"),
+    ("TEXT", "Truist"),
+]
+
+# Lowercase literals, at least one of which must appear in the subject or
+# flattened body before a parser is worth running. Each check looks at the
+# subject first and falls back to the flattened body, which is built once per
+# email and shared by every later check and parser. Every parser's check runs,
+# so in practice the body of almost every email is flattened; the gate saves
+# each skipped parser's own cleanup and field scan. Parsers without an entry
+# always run.
+PARSER_SIGNATURES: dict[str, tuple[str, ...]] = {
+    "duke_energy": ("duke",),
+    "psnc_energy": ("psnc", "dominion", "enbridge"),
+    "raleigh_water": ("raleigh",),
+    "truist_mortgage": ("truist",),
+}
+
+
+def extract_bills(
+    emails: list[dict[str, Any]], today_iso: str | None = None
+) -> list[dict[str, Any]]:
+    """Run available parsers over the provided emails.
+
+    ``today_iso`` is the reference date used to flag overdue bills; it is
+    computed once here (or by the caller) and shared by every parser.
+    """
+    if today_iso is None:
+        today_iso = date.today().isoformat()
 
-def extract_bills(emails: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Run available parsers over the provided emails."""
     bills: list[dict[str, Any]] = []
 
     for email in emails:
         for parser_name, parser in PARSERS:
+            signatures = PARSER_SIGNATURES.get(parser_name)
+            if signatures and not mentions(email, signatures):
+                continue
+
             try:
-                parsed = parser(email)
-            except Exception as err:  # pragma: no cover - defensive
+                parsed = parser(email, today_iso)
+            except (AttributeError, KeyError, TypeError, ValueError) as err:
+                # Malformed input only; anything else is a parser bug and is
+                # logged by the coordinator for the whole message
                 _LOGGER.debug("Parser %s failed: %s", parser_name, err)
                 continue
 
@@ -0,0 +1,105 @@
+"""Body cleanup and field helpers shared by the bill parsers."""
+from __future__ import annotations
+
+from html import unescape
+import re
+from typing import Any
+
+from ..const import (
+    EMAIL_ATTR_BODY,
+    EMAIL_ATTR_SEARCH_TEXT,
+    EMAIL_ATTR_SUBJECT,
+    EMAIL_ATTR_TEXT,
+)
+
+_MARKUP_RUN_RE = re.compile(r"(?:<[^>]+>|\s)+")
+
+
+def flatten_html(value: str) -> str:
+    """Reduce an HTML body to a single line of searchable text."""
+    if not value:
+        return ""
+
+    # Transfer encodings are already undone when the coordinator extracts the
+    # body, so only HTML cleanup is needed here
+    text = value if isinstance(value, str) else value.decode("utf-8", "ignore")
+    text = unescape(text)
+    # Every tag ends up as whitespace and all whitespace collapses to a single
+    # space, so each run of tags and whitespace is one substitution
+    return _MARKUP_RUN_RE.sub(" ", text).strip()
+
+
+def body_text(email: dict[str, Any]) -> str:
+    """Return the flattened body of an email, stored on it for later parsers."""
+    text = email.get(EMAIL_ATTR_TEXT)
+    if text is None:
+        text = email[EMAIL_ATTR_TEXT] = flatten_html(email.get(EMAIL_ATTR_BODY) or "")
+    return text
+
+
+def search_text(email: dict[str, Any]) -> str:
+    """Return the lowercased subject and flattened body used to spot providers.
+
+    Phrases split by tags, entities or line wraps in the raw body still match.
+    """
+    text = email.get(EMAIL_ATTR_SEARCH_TEXT)
+    if text is None:
+        subject = (email.get(EMAIL_ATTR_SUBJECT) or "").strip()
+        text = email[EMAIL_ATTR_SEARCH_TEXT] = f"{subject} {body_text(email)}".lower()
+    return text
+
+
+def mentions(email: dict[str, Any], phrases: tuple[str, ...]) -> bool:
+    """Return True if the subject or flattened body contains any of ``phrases``.
+
+    The subject is checked first, so a hit there never flattens the body.
+    """
+    subject = (email.get(EMAIL_ATTR_SUBJECT) or "").lower()
+    if any(phrase in subject for phrase in phrases):
+        return True
+    text = search_text(email)
+    return any(phrase in text for phrase in phrases)
+
+
+def search_fields(pattern: re.Pattern[str], text: str) -> dict[str, str | None]:
+    """Collect the first occurrence of every named group in one pass.
+
+    ``pattern`` is an alternation with one branch per label. Free-text values
+    are captured inside a lookahead, as in ``Label:(?=(?P<name>...))``, so the
+    match ends at the label and the label that follows the value can still
+    match later in the same scan.
+    """
+    fields: dict[str, str | None] = {}
+    for match in pattern.finditer(text):
+        # An alternative may fill more than one group, e.g. an amount and the
+        # date it was paid on
+        for name, value in match.groupdict().items():
+            if value is not None and name not in fields:
+                fields[name] = value.strip() or None
+    return fields
+
+
+def parse_amount(value: str | None) -> tuple[str | None, float | None]:
+    """Return the dollar display string and numeric value of an amount."""
+    if not value:
+        return None, None
+
+    normalized = value.replace(",", "")
+    try:
+        amount = float(normalized)
+    except ValueError:
+        amount = None
+
+    display = value
+    if not display.startswith("$"):
+        display = f"${display}"
+
+    return display, amount
+
+
+def derive_status(due_iso: str | None, today_iso: str) -> str:
+    """Flag a bill as overdue once its due date has passed."""
+    # ISO-8601 dates order correctly as plain strings
+    if due_iso and due_iso < today_iso:
+        return "overdue"
+    return "due"
@@ -0,0 +1,111 @@
+"""Date parsing shared by the bill parsers."""
+from __future__ import annotations
+
+from datetime import date
+from functools import lru_cache
+import re
+
+MONTHS = {
+    "jan": 1,
+    "january": 1,
+    "feb": 2,
+    "february": 2,
+    "mar": 3,
+    "march": 3,
+    "apr": 4,
+    "april": 4,
+    "may": 5,
+    "jun": 6,
+    "june": 6,
+    "jul": 7,
+    "july": 7,
+    "aug": 8,
+    "august": 8,
+    "sep": 9,
+    "sept": 9,
+    "september": 9,
+    "oct": 10,
+    "october": 10,
+    "nov": 11,
+    "november": 11,
+    "dec": 12,
+    "december": 12,
+}
+
+_TOKEN_SPLIT_RE = re.compile(r"[\s,/\-]+")
+# Any word followed by a day and year, or a numeric date. The word is looked
+# up in MONTHS rather than matched through a backtracking month alternation.
+_DATE_CANDIDATE_RE = re.compile(
+    r"\b([A-Za-z]{3,9})\.?\s+\d{1,2},?\s+\d{4}|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}",
+    re.ASCII,
+)
+
+
+@lru_cache(maxsize=1024)
+def parse_date_iso(value: str | None) -> str | None:
+    """Convert a bill date such as "Oct 5, 2026" or "10/05/26" to ISO format.
+
+    Accepts ISO dates, "<month name> <day>[,] <year>" and numeric m/d/y with
+    ``/`` or ``-`` separators. Returns ``None`` for anything else.
+    """
+    if not value:
+        return None
+
+    cleaned = value.replace(".", "").strip()
+    if not cleaned:
+        return None
+
+    if len(cleaned) == 10 and cleaned[4] == "-" and cleaned[7] == "-":
+        try:
+            return date.fromisoformat(cleaned).isoformat()
+        except ValueError:
+            return None
+
+    parts = _TOKEN_SPLIT_RE.split(cleaned)
+    if len(parts) != 3:
+        return None
+
+    month_token, day_token, year_token = parts
+    if month_token.isalpha():
+        month = MONTHS.get(month_token.lower())
+    elif _is_number(month_token, 2):
+        month = int(month_token)
+    else:
+        return None
+
+    if month is None or not _is_number(day_token, 2) or not _is_number(year_token, 4):
+        return None
+
+    year = int(year_token)
+    if len(year_token) == 2:
+        # Same pivot as strptime's %y
+        year += 2000 if year < 69 else 1900
+    elif len(year_token) != 4:
+        return None
+
+    try:
+        return date(year, month, int(day_token)).isoformat()
+    except ValueError:
+        return None
+
+
+def extract_first_date(value: str | None) -> str | None:
+    """Return the first date found in a field value.
+
+    Falls back to the whole stripped value so unrecognised formats still show
+    up in the bill, just without an ISO date.
+    """
+    if not value:
+        return None
+
+    for match in _DATE_CANDIDATE_RE.finditer(value):
+        month_word = match.group(1)
+        if month_word is None or month_word.lower() in MONTHS:
+            return match.group(0).strip()
+
+    cleaned = value.strip()
+    return cleaned or None
+
+
+def _is_number(token: str, max_digits: int) -> bool:
+    return token.isascii() and token.isdigit() and len(token) <= max_digits
@@ -1,9 +1,7 @@
 """Parser for PSNC Energy / Dominion Energy gas billing emails."""
 from __future__ import annotations
 
-from datetime import datetime
 from html import unescape
-import quopri
 import re
 from typing import Any
 
@@ -18,18 +16,27 @@ from ..const import (
     EMAIL_ATTR_ADDRESS,
     EMAIL_ATTR_SUBJECT,
 )
-
-ACCOUNT_RE = re.compile(r"Account\s+Ending\s+In:\s*([A-Za-z0-9*]+)", re.IGNORECASE)
-AMOUNT_DRAFT_RE = re.compile(
-    r"Amount\s+to\s+Be\s+Drafted:\s*\$?([0-9,]+(?:\.[0-9]{2})?)",
-    re.IGNORECASE,
-)
-BANK_DRAFT_DATE_RE = re.compile(
-    r"Date\s+of\s+Bank\s+Draft:\s*([A-Za-z0-9.,\-/ ]+)",
-    re.IGNORECASE,
+from ._common import derive_status, mentions, parse_amount, search_fields
+from ._dateparse import extract_first_date, parse_date_iso
+
+# All labelled fields in one scan; the draft date and service address are
+# free text.
+FIELDS_RE = re.compile(
+    r"Account\s+Ending\s+In:\s*(?P<account>[A-Za-z0-9*]+)"
+    r"|Amount\s+to\s+Be\s+Drafted:\s*\$?(?P<amount>[0-9,]+(?:\.[0-9]{2})?)"
+    r"|Date\s+of\s+Bank\s+Draft:\s*(?=(?P<draft_date>[A-Za-z0-9.,\-/ ]+))"
+    r"|Service\s+Address:\s*(?=(?P<service_address>[A-Za-z0-9.,#*\- ]+))",
+    # ASCII keeps IGNORECASE from letting [A-Za-z] match e.g. the Kelvin sign
+    re.IGNORECASE | re.ASCII,
 )
-SERVICE_ADDRESS_RE = re.compile(
-    r"Service\s+Address:\s*([A-Za-z0-9.,#*\- ]+)", re.IGNORECASE
+_CHAR_TRANSLATE = str.maketrans({"\r": "\n", "\xa0": " "})
+_TAG_RE = re.compile(r"<(br\s*/?)>|<[^>]+>", re.IGNORECASE)
+_WS_RUN_RE = re.compile(r"[ \t\n]+")
+# Masked account numbers keep only their digits and "*" placeholders.
+# FIELDS_RE is ASCII-only, so the account group can only capture ASCII
+# letters, digits and "*", all of which this Latin-1 deletion table covers.
+_ACCOUNT_TRANSLATE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if chr(c) not in "0123456789*")
 )
 
 IDENTIFIERS = (
@@ -41,34 +48,32 @@ IDENTIFIERS = (
 )
 
 
-def parse_psnc_energy(email: dict[str, Any]) -> dict[str, Any] | None:
+def parse_psnc_energy(
+    email: dict[str, Any], today_iso: str
+) -> dict[str, Any] | None:
     """Parse PSNC Energy billing notification."""
     subject = (email.get(EMAIL_ATTR_SUBJECT) or "").strip()
     body = email.get(EMAIL_ATTR_BODY) or ""
 
-    normalized = _normalize(body)
-    combined = f"{subject} {normalized}".lower()
-
-    if not any(identifier in combined for identifier in IDENTIFIERS):
+    if not mentions(email, IDENTIFIERS):
         return None
 
-    account_raw = _search_group(ACCOUNT_RE, normalized)
-    account_number = _normalize_account(account_raw)
+    normalized = _normalize(body)
+
+    fields = search_fields(FIELDS_RE, normalized)
+    account_number = _normalize_account(fields.get("account"))
 
-    amount_display, amount_value = _parse_amount(
-        _search_group(AMOUNT_DRAFT_RE, normalized)
-    )
+    amount_display, amount_value = parse_amount(fields.get("amount"))
 
-    draft_display = _search_group(BANK_DRAFT_DATE_RE, normalized)
-    draft_display = _extract_first_date(draft_display)
-    draft_iso = _parse_date_iso(draft_display)
+    draft_display = extract_first_date(fields.get("draft_date"))
+    draft_iso = parse_date_iso(draft_display)
 
-    service_address = _search_group(SERVICE_ADDRESS_RE, normalized)
+    service_address = fields.get("service_address")
 
     if not any((account_number, amount_display, draft_display)):
         return None
 
-    status = _derive_status(draft_iso)
+    status = derive_status(draft_iso, today_iso)
 
     bill = {
         "id": email.get("message_id") or email.get("uid"),
@@ -83,19 +88,13 @@ def parse_psnc_energy(email: dict[str, Any]) -> dict[str, Any] | None:
         "snippet": normalized[:DEFAULT_SNIPPET_LENGTH],
         "from_address": email.get(EMAIL_ATTR_ADDRESS),
         ATTR_ACCOUNT_NUMBER: account_number,
+        # Draft notices have no billing date, but the key is kept for sensors
+        ATTR_BILLING_DATE: None,
+        ATTR_BILLING_DATE_ISO: None,
+        "service_address": service_address,
+        EMAIL_ATTR_FROM: email.get(EMAIL_ATTR_FROM) or None,
     }
 
-    if service_address:
-        bill["service_address"] = service_address
-
-    # Some sensors expect billing keys even if missing
-    bill.setdefault(ATTR_BILLING_DATE, None)
-    bill.setdefault(ATTR_BILLING_DATE_ISO, None)
-
-    from_display = email.get(EMAIL_ATTR_FROM)
-    if from_display:
-        bill[EMAIL_ATTR_FROM] = from_display
-
     return bill
 
 
@@ -103,117 +102,28 @@ def _normalize(value: str) -> str:
     if not value:
         return ""
 
-    text = value
-    try:
-        decoded = quopri.decodestring(text)
-        if isinstance(decoded, bytes):
-            text = decoded.decode("utf-8", "ignore")
-        else:
-            text = decoded
-    except Exception:
-        if not isinstance(text, str):
-            text = text.decode("utf-8", "ignore")
-
-    text = unescape(text)
-    text = text.replace("\r", "\n")
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = text.replace("\xa0", " ")
-    text = re.sub(r"\n+", "\n", text)
-    text = re.sub(r"[ \t]+", " ", text)
-    return text.strip()
-
-
-def _search_group(pattern: re.Pattern[str], text: str) -> str | None:
-    match = pattern.search(text)
-    if match:
-        value = match.group(1).strip()
-        return value or None
-    return None
-
-
-def _parse_amount(value: str | None) -> tuple[str | None, float | None]:
-    if not value:
-        return None, None
+    # Bodies arrive with their transfer encoding already decoded
+    text = value if isinstance(value, str) else value.decode("utf-8", "ignore")
+    text = unescape(text).translate(_CHAR_TRANSLATE)
+    # Line breaks are kept so free-text fields stop at the end of their line
+    text = _TAG_RE.sub(_replace_tag, text)
+    return _WS_RUN_RE.sub(_collapse_whitespace, text).strip()
 
-    normalized = value.replace(",", "")
-    try:
-        amount = float(normalized)
-    except ValueError:
-        amount = None
 
-    display = value
-    if not display.startswith("$"):
-        display = f"${display}"
-    return display, amount
+def _replace_tag(match: re.Match[str]) -> str:
+    return "\n" if match.group(1) is not None else " "
 
 
-def _extract_first_date(value: str | None) -> str | None:
-    if not value:
-        return None
-
-    date_match = re.search(
-        r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}"
-        r"|\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-        value,
-        flags=re.IGNORECASE,
-    )
-    if date_match:
-        return date_match.group(1).strip()
-
-    cleaned = value.strip()
-    return cleaned or None
-
-
-def _parse_date_iso(value: str | None) -> str | None:
-    if not value:
-        return None
-
-    cleaned = (
-        value.replace("\n", " ")
-        .replace("\r", " ")
-        .replace("\xa0", " ")
-        .replace(".", "")
-    )
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-
-    for fmt in (
-        "%B %d, %Y",
-        "%b %d, %Y",
-        "%B %d %Y",
-        "%b %d %Y",
-        "%m/%d/%Y",
-        "%m/%d/%y",
-        "%m-%d-%Y",
-        "%m-%d-%y",
-    ):
-        try:
-            return datetime.strptime(cleaned, fmt).date().isoformat()
-        except ValueError:
-            continue
-    return None
-
-
-def _derive_status(due_iso: str | None) -> str:
-    if not due_iso:
-        return "due"
-
-    try:
-        due_date = datetime.fromisoformat(due_iso).date()
-    except ValueError:
-        return "due"
-
-    today = datetime.utcnow().date()
-    if due_date < today:
-        return "overdue"
-    return "due"
+def _collapse_whitespace(match: re.Match[str]) -> str:
+    run = match.group(0)
+    if "\n" not in run:
+        return " "
+    # Drop blank lines and trailing spaces but keep one space of indent
+    return "\n" if run.endswith("\n") else "\n "
 
 
 def _normalize_account(value: str | None) -> str | None:
     if not value:
         return None
 
-    cleaned = value.replace(" ", "")
-    cleaned = re.sub(r"[^0-9*]", "", cleaned)
-    return cleaned or None
+    return value.translate(_ACCOUNT_TRANSLATE) or None
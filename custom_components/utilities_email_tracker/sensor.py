@@ -1,11 +1,9 @@
 """Sensor platform for Utilities Email Tracker."""
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -48,29 +46,32 @@ class UtilitiesEmailTrackerSensor(CoordinatorEntity[UtilitiesEmailTrackerCoordin
             "manufacturer": "Utilities Email Tracker",
             "model": "Email Bill Monitor",
         }
+        self._update_from_data()
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of detected bills."""
-        if not self.coordinator.data:
-            return 0
-        return int(self.coordinator.data.get(ATTR_COUNT, 0))
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the cached state before it is written."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Expose detailed bill information."""
-        if not self.coordinator.data:
-            return {
+    def _update_from_data(self) -> None:
+        """Build state and attributes once per refresh rather than per read."""
+        data = self.coordinator.data
+        if not data:
+            self._attr_native_value = 0
+            self._attr_extra_state_attributes = {
                 ATTR_BILLS: [],
                 ATTR_SUMMARY: {},
                 ATTR_COUNT: 0,
             }
+            return
 
-        return {
-            ATTR_BILLS: self.coordinator.data.get(ATTR_BILLS, []),
-            ATTR_SUMMARY: self.coordinator.data.get(ATTR_SUMMARY, {}),
-            ATTR_COUNT: self.coordinator.data.get(ATTR_COUNT, 0),
-            ATTR_LAST_UPDATE: self.coordinator.data.get(ATTR_LAST_UPDATE),
+        self._attr_native_value = int(data.get(ATTR_COUNT, 0))
+        self._attr_extra_state_attributes = {
+            ATTR_BILLS: data.get(ATTR_BILLS, []),
+            ATTR_SUMMARY: data.get(ATTR_SUMMARY, {}),
+            ATTR_COUNT: data.get(ATTR_COUNT, 0),
+            ATTR_LAST_UPDATE: data.get(ATTR_LAST_UPDATE),
         }
 
     @property